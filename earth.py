@@ -1,40 +1,19 @@
+import numpy as np
 from skyfield import api
 from skyfield import almanac
+from skyfield.nutationlib import iau2000b_radians
 
 EVENT_VERNAL_EQUINOX = 0
 EVENT_SUMMER_SOLSTICE = 1
 EVENT_AUTUMNAL_EQUINOX = 2
 EVENT_WINTER_SOLSTICE = 3
 
-timescale = api.load.timescale()
+timescale = api.load.timescale(builtin=True)
 ephemeris = api.load('de421.bsp')
-greenwich = api.Topos('51.48 N', '0 W')
-
-
-class Event:
-    """
-    Class composed of an event value and an event label string.
-    """
-
-    def __init__(self, value, label):
-        self.value = value
-        self.label = label
-
-    def __repr__(self):
-        return self.label
-
-
-class EventTime:
-    """
-    Class composed of an Event object and a Skyfield Time object.
-    """
-
-    def __init__(self, event, time):
-        self.event = event
-        self.time = time
-
-    def __repr__(self):
-        return '{} at {}'.format(self.event, self.time.utc_strftime('%Y-%m-%d %H:%M:%S'))
+greenwich = api.wgs84.latlon(51.48, 0.0)
+greenwich_observer = ephemeris['earth'] + greenwich
+sun = ephemeris['sun']
+seasons_func = almanac.seasons(ephemeris)
 
 
 class EarthModel:
@@ -59,57 +38,115 @@ class EarthModel:
         self.rotation_degrees = rotation_degrees
 
 
+class EventTimesCache:
+    """
+    Class composed of an event times function, a window function, and the event times produced within a window.
+    The window function maps a TT julian date to a tuple of start and end Time objects.
+    The event times are stored as parallel arrays of sorted TT julian dates and event values.
+    """
+
+    def __init__(self, events_func, window_func):
+        self.events_func = events_func
+        self.window_func = window_func
+        self.tts = np.array([])
+        self.values = np.array([], dtype=np.int8)
+
+    def refresh(self, tt):
+        t0, t1 = self.window_func(tt)
+        self.tts, self.values = self.events_func(t0, t1)
+
+
 def season_event_times(start, end):
     """
     Computes season event times between start and end.
-    Returns list of EventTime objects.
+    Returns tuple of TT julian date array and season event value array.
     """
-    t, y = almanac.find_discrete(start, end, almanac.seasons(ephemeris))
-    return [EventTime(Event(event, almanac.SEASON_EVENTS[event]), time) for time, event in zip(t, y)]
+    t, y = almanac.find_discrete(start, end, seasons_func)
+    return t.tt, y.astype(np.int8)
 
 
-def rise_set_event_times(start, end):
+def truncated_nutation(time):
     """
-    Computes sunrise and sunset times between start and end.
-    Returns list of EventTime objects.
+    Assigns nutation angles from the truncated IAU 2000B model to the input Time,
+    sparing the full IAU 2000A model that Skyfield otherwise computes for apparent positions and sidereal time.
+    The difference is around a milliarcsecond, far below the resolution of the physical model.
+    Returns the input Time.
     """
-    t, y = almanac.find_discrete(start, end, almanac.sunrise_sunset(ephemeris, greenwich))
-    return [EventTime(Event(rise, 'Sunrise' if rise else 'Sunset'), time) for time, rise in zip(t, y)]
+    time._nutation_angles_radians = iau2000b_radians(time)
+    return time
 
 
 def noon_nadir_event_times(start, end):
     """
-    Computes solar noon and nadir event times as midpoints between sunrise and sunset events.
-    Returns list of EventTime objects.
+    Computes solar noon and nadir event times between start and end from the local hour angle of the sun.
+    Solar noon occurs at hour angle 0h and nadir at hour angle 12h.
+    Each event starts from mean solar time at the observer longitude and is corrected by the hour angle error.
+    Returns tuple of TT julian date array and event value array, with value 1 for solar noon and 0 for nadir.
+    """
+    # mean solar noon (whole UT1 julian dates) and nadir (half dates) at the observer longitude
+    halves = np.arange(np.floor(start.ut1 * 2) - 1, np.ceil(end.ut1 * 2) + 2)
+    noon = halves % 2 == 0
+    t = truncated_nutation(timescale.ut1_jd(halves / 2 - greenwich.longitude.degrees / 360))
+
+    # the hour angle of the sun advances about one hour per hour, so two corrections converge to well under a second
+    for _ in range(2):
+        ra = greenwich_observer.at(t).observe(sun).apparent().radec(epoch='date')[0]
+        hour_angle = t.gast + greenwich.longitude.degrees / 15 - ra.hours
+        error = (hour_angle - np.where(noon, 0, 12) + 12) % 24 - 12
+        t = truncated_nutation(timescale.ut1_jd(t.ut1 - error / 24))
+
+    within = (start.tt < t.tt) & (t.tt < end.tt)
+    return t.tt[within], noon[within].astype(np.int8)
+
+
+def find_surrounding_events(tts, values, tt):
+    """
+    Locates the events that straddle the input TT julian date.
+    Input TT julian dates are sorted and parallel to the input event values.
+    Returns tuple of the TT julian dates of both events and the value of the earlier event.
+    """
+    i = np.searchsorted(tts, tt)
+    return float(tts[i - 1]), float(tts[i]), int(values[i - 1])
+
+
+def surrounding_events(tt, cache):
+    """
+    Locates the cached event times that straddle the input TT julian date.
+    The cache is refreshed around the input date when the input date reaches the last cached event pair.
+    No Time objects are constructed unless the cache is refreshed.
+    Returns tuple of the TT julian dates of both events and the value of the earlier event.
     """
-    result = []
-    rs_event_times = rise_set_event_times(start, end)
-    for x, y in zip(rs_event_times, rs_event_times[1:]):
-        delta = y.time - x.time
-        midpoint = timescale.tt_jd(x.time.tt + delta / 2)
-        result.append(EventTime(Event(x.event.value, 'Solor noon' if x.event.value else 'Nadir'), midpoint))
-    return result
+    if len(cache.tts) < 2 or not cache.tts[0] < tt <= cache.tts[-2]:
+        cache.refresh(tt)
+    return find_surrounding_events(cache.tts, cache.values, tt)
 
 
-def find_surrounding_events(events, time):
+def season_window(tt):
     """
-    Locates the event times that straddle the input time.
-    Returns tuple of EventTime objects.
+    Computes the window of three calendar years starting with the year prior to the input TT julian date.
+    The window always includes the season events that straddle any time in the following year.
     """
-    for x, y in zip(events, events[1:]):
-        if x.time.tt < time.tt < y.time.tt:
-            return x, y
+    year = timescale.tt_jd(tt).utc[0]
+    return timescale.utc(year - 1, 1, 1), timescale.utc(year + 2, 1, 1)
 
 
-def surrounding_events(time, julian_time, events_func):
+def noon_nadir_window(tt):
     """
-    Locates the event times that straddle the input time.
-    Returns tuple of objects provided by the input function.
+    Computes the rolling window from the day prior to the input TT julian date through the following week.
     """
-    t0 = timescale.tt_jd(time.tt - julian_time)
-    t1 = timescale.tt_jd(time.tt + julian_time)
-    sets = events_func(t0, t1)
-    return find_surrounding_events(sets, time)
+    return timescale.tt_jd(tt - 1), timescale.tt_jd(tt + 7)
+
+
+season_events = EventTimesCache(season_event_times, season_window)
+noon_nadir_events = EventTimesCache(noon_nadir_event_times, noon_nadir_window)
+
+
+def precompute_event_times(time):
+    """
+    Computes the cached season and solar noon/nadir event times around the input time.
+    """
+    season_events.refresh(time.tt)
+    noon_nadir_events.refresh(time.tt)
 
 
 def relative_to_absolute_orbit_degrees(season, degrees):
@@ -128,56 +165,109 @@ def relative_to_absolute_orbit_degrees(season, degrees):
     return 90 + degrees
 
 
-def position_as_percent(events, time):
+def position_as_percent(start_tt, end_tt, tt):
     # total time separating pair of events
-    range = events[1].time - events[0].time
+    range = end_tt - start_tt
 
     # position within range [0, range]
-    position = time - events[0].time
+    position = tt - start_tt
 
     # convert position to fractional value [0.0, 1.0]
     return position / range
 
 
-def orbit_degrees_from_winter_solstice(time):
+def orbit_degrees(tt, season_tt, next_season_tt, season):
     """
-    Computes earth orbit degrees of the input time relative to winter solstice on specialized scale.
+    Computes earth orbit degrees from TT julian dates of a time and the season events that straddle it.
     Scale goes from 0-180 between winter solstice and summer solstice
     and back down from 180-0 between summer solstice and winter solstice.
     Equinoxes are both 90.
     """
-    # determine pair of straddling season events
-    evts = surrounding_events(time, 100, season_event_times)
-
     # convert fractional value to seasonal degrees offset [0, 90]
-    degrees = position_as_percent(evts, time) * 90
+    degrees = position_as_percent(season_tt, next_season_tt, tt) * 90
 
     # adjust for the 180-degree spectrum, starting from winter solstice
-    return relative_to_absolute_orbit_degrees(evts[0].event.value, degrees)
+    return relative_to_absolute_orbit_degrees(season, degrees)
 
 
-def rotation_degrees_from_solar_noon(time):
+def rotation_degrees(tt, event_tt, next_event_tt, noon):
     """
-    Computes earth rotation degrees of the input time relative to last solar noon.
+    Computes earth rotation degrees from TT julian dates of a time and the solar noon/nadir events that straddle it.
     Scale goes from 0-360 between solar noon on the previous day and the next day.
     """
-    # determine pair of solar noon/nadir events
-    evts = surrounding_events(time, 1, noon_nadir_event_times)
-
     # convert fractional value to degrees offset [0, 180]
-    degrees = position_as_percent(evts, time) * 180
+    degrees = position_as_percent(event_tt, next_event_tt, tt) * 180
 
     # add 180 degrees is prior event is nadir
-    return degrees if evts[0].event.value else degrees + 180
+    return degrees if noon else degrees + 180
+
+
+def model_degrees(tt, season_tt, next_season_tt, season, event_tt, next_event_tt, noon):
+    """
+    Computes earth orbit degrees and earth rotation degrees using plain float arithmetic on TT julian dates.
+    Returns tuple of orbit degrees and rotation degrees, with rotation degrees net of orbit degrees.
+    """
+    orbit = orbit_degrees(tt, season_tt, next_season_tt, season)
+    rotation = rotation_degrees(tt, event_tt, next_event_tt, noon) - orbit
+    if rotation < 0:
+        rotation = rotation + 360
+    return orbit, rotation
+
+
+def next_orbit_step_tt(tt, season_tt, next_season_tt, season, steps_per_degree):
+    """
+    Computes the TT julian date at which orbit degrees next cross a whole step, given the steps per degree
+    and TT julian dates of a time and the season events that straddle it.
+    Orbit degrees are linear in time within a season, so the crossing is exact.
+    The next season event is returned if the season ends first, as orbit degrees may change direction there.
+    """
+    # steps at both season events and at the input time
+    start = orbit_degrees(season_tt, season_tt, next_season_tt, season) * steps_per_degree
+    end = orbit_degrees(next_season_tt, season_tt, next_season_tt, season) * steps_per_degree
+    steps = orbit_degrees(tt, season_tt, next_season_tt, season) * steps_per_degree
+
+    # rising steps cross the next whole step, falling steps cross the current one
+    boundary = int(steps) + 1 if end > start else int(steps)
+    if not min(start, end) <= boundary <= max(start, end):
+        return next_season_tt
+    return season_tt + (boundary - start) / (end - start) * (next_season_tt - season_tt)
+
+
+def next_rotation_step_tt(tt, season_tt, next_season_tt, season, event_tt, next_event_tt, noon, steps_per_degree):
+    """
+    Computes the TT julian date at which rotation degrees, net of orbit degrees, next cross a whole step,
+    given the steps per degree and TT julian dates of a time and the season and solar noon/nadir events that straddle it.
+    Rotation degrees are linear in time between solar noon/nadir events and orbit degrees are linear within a season,
+    so the crossing is exact.
+    The next season or solar noon/nadir event is returned if it comes first, as either rate may change there.
+    """
+    _, rotation = model_degrees(tt, season_tt, next_season_tt, season, event_tt, next_event_tt, noon)
+    steps = rotation * steps_per_degree
+
+    # net rotation rate in degrees per day
+    rotation_rate = 180 / (next_event_tt - event_tt)
+    orbit_rate = (orbit_degrees(next_season_tt, season_tt, next_season_tt, season) -
+                  orbit_degrees(season_tt, season_tt, next_season_tt, season)) / (next_season_tt - season_tt)
+
+    crossing_tt = tt + (int(steps) + 1 - steps) / steps_per_degree / (rotation_rate - orbit_rate)
+    return min(crossing_tt, next_event_tt, next_season_tt)
+
+
+def compute_angles(time):
+    """
+    Computes earth orbit degrees and earth rotation degrees of the input time in a single pass.
+    Both event lookups share the TT julian date of the input time.
+    Returns tuple of orbit degrees and rotation degrees, with rotation degrees net of orbit degrees.
+    """
+    tt = time.tt
+    season_tt, next_season_tt, season = surrounding_events(tt, season_events)
+    event_tt, next_event_tt, noon = surrounding_events(tt, noon_nadir_events)
+    return model_degrees(tt, season_tt, next_season_tt, season, event_tt, next_event_tt, noon)
 
 
 def earth_model(time):
-    orbit_degrees = orbit_degrees_from_winter_solstice(time)
-    rotation_degrees = rotation_degrees_from_solar_noon(time)
-    rotation_degrees = rotation_degrees - orbit_degrees
-    if rotation_degrees < 0:
-        rotation_degrees = rotation_degrees + 360
-    return EarthModel(orbit_degrees, rotation_degrees)
+    orbit, rotation = compute_angles(time)
+    return EarthModel(orbit, rotation)
 
 
 def earth_model_now():
@@ -11,10 +11,15 @@ from adafruit_motor import stepper
 
 logger = logging.getLogger(__name__)
 
-ts = api.load.timescale()
+ts = api.load.timescale(builtin=True)
 
 STEPS_PER_REV = 200
-DEGREES_PER_STEP = 360.0 / STEPS_PER_REV
+STEPS_PER_DEGREE = STEPS_PER_REV / 360.0
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# extra sleep to land just past a step boundary rather than just short of it
+STEP_SLEEP_PADDING = 1.0
 
 kit = MotorKit()
 steppers = [kit.stepper1, kit.stepper2]
@@ -42,18 +47,25 @@ def init_logger(file_name):
 
 
 def take_steps(forward, motor, steps, sleep):
+    direction = stepper.FORWARD if forward else stepper.BACKWARD
+    onestep = motor.onestep
+    sleep_fn = time.sleep
     for i in range(steps):
-        motor.onestep(direction=stepper.FORWARD if forward else stepper.BACKWARD)
-        time.sleep(sleep)
+        onestep(direction=direction)
+        sleep_fn(sleep)
 
 
 def step_while_over_sensor(step_forward, motor, sensor, max_steps, sleep):
+    direction = stepper.FORWARD if step_forward else stepper.BACKWARD
+    sensing = sensor.sensing
+    onestep = motor.onestep
+    sleep_fn = time.sleep
     steps = 0
     found = False
     while not found and steps < max_steps:
-        if sensor.sensing():
-            motor.onestep(direction=stepper.FORWARD if step_forward else stepper.BACKWARD)
-            time.sleep(sleep)
+        if sensing():
+            onestep(direction=direction)
+            sleep_fn(sleep)
             steps = steps + 1
         else:
             found = True
@@ -61,14 +73,18 @@ def step_while_over_sensor(step_forward, motor, sensor, max_steps, sleep):
 
 
 def step_until_over_sensor(step_forward, motor, sensor, max_steps, sleep):
+    direction = stepper.FORWARD if step_forward else stepper.BACKWARD
+    sensing = sensor.sensing
+    onestep = motor.onestep
+    sleep_fn = time.sleep
     steps = 0
     found = False
     while not found and steps < max_steps:
-        if sensor.sensing():
+        if sensing():
             found = True
         else:
-            motor.onestep(direction=stepper.FORWARD if step_forward else stepper.BACKWARD)
-            time.sleep(sleep)
+            onestep(direction=direction)
+            sleep_fn(sleep)
             steps = steps + 1
     return found, steps
 
@@ -81,7 +97,7 @@ def scan(forward, motor, sensor, max_scan_steps, max_sensor_steps, sleep):
         logger.info('scan back off of sensor failed')
         return False
 
-    logger.info('scanned {} steps back off of sensor'.format(steps))
+    logger.info('scanned %d steps back off of sensor', steps)
     logger.info('scanning forward to sensor')
 
     found, steps = step_until_over_sensor(forward, motor, sensor, max_scan_steps, sleep)
@@ -89,7 +105,7 @@ def scan(forward, motor, sensor, max_scan_steps, max_sensor_steps, sleep):
         logger.info('scan forward to sensor failed')
         return False
 
-    logger.info('scanned {} steps forward to sensor'.format(steps))
+    logger.info('scanned %d steps forward to sensor', steps)
     logger.info('scanning forward off of sensor')
 
     found, steps = step_while_over_sensor(forward, motor, sensor, max_sensor_steps, sleep)
@@ -97,7 +113,7 @@ def scan(forward, motor, sensor, max_scan_steps, max_sensor_steps, sleep):
         logger.info('scan forward off of sensor failed')
         return False
 
-    logger.info('scanned {} steps forward off of sensor'.format(steps))
+    logger.info('scanned %d steps forward off of sensor', steps)
     logger.info('scanning back to midpoint')
 
     take_steps(not forward, motor, int(steps / 2), sleep)
@@ -107,28 +123,28 @@ def scan(forward, motor, sensor, max_scan_steps, max_sensor_steps, sleep):
 
 def validate_orbit_degrees(degrees):
     if not 0 <= degrees <= 180:
-        logger.error('unexpected orbit degrees: {}'.format(degrees))
+        logger.error('unexpected orbit degrees: %s', degrees)
         sys.exit(1)
 
 
 def validate_rotation_degrees(degrees):
     if not 0 <= degrees <= 360:
-        logger.error('unexpected rotation degrees: {}'.format(degrees))
+        logger.error('unexpected rotation degrees: %s', degrees)
         sys.exit(1)
 
 
 def steps_and_floor(degrees):
-    steps = degrees / DEGREES_PER_STEP
+    steps = degrees * STEPS_PER_DEGREE
     floor = int(steps)
     return steps, floor
 
 
 def print_earth_model(em, orbit_steps, rotation_steps):
-    logger.info('orbit[degrees={:0.4f}, steps={:0.4f}], rotation[degrees={:0.4f}, steps={:0.4f}]'.format(
-        em.orbit_degrees,
-        orbit_steps,
-        em.rotation_degrees,
-        rotation_steps))
+    logger.info('orbit[degrees=%0.4f, steps=%0.4f], rotation[degrees=%0.4f, steps=%0.4f]',
+                em.orbit_degrees,
+                orbit_steps,
+                em.rotation_degrees,
+                rotation_steps)
 
 
 def main():
@@ -136,6 +152,9 @@ def main():
 
     sleep = 0.05
 
+    # compute season and solar noon/nadir event times up front so that each model update is a lookup
+    earth.precompute_event_times(ts.now())
+
     # scan to base position on lower earth orbit motor
     # when the magnet is directly over the hall effect sensor, it's winter solstice in the northern hemisphere
     # that is the northern hemisphere is pointing away from the sun
@@ -160,7 +179,11 @@ def main():
     take_steps(True, steppers[1], rotation_steps_floor, sleep)
 
     while True:
-        em = earth.earth_model_now()
+        # look up the straddling events once and share them between the model and the next step times
+        tt = ts.now().tt
+        seasons = earth.surrounding_events(tt, earth.season_events)
+        noon_nadir = earth.surrounding_events(tt, earth.noon_nadir_events)
+        em = earth.EarthModel(*earth.model_degrees(tt, *seasons, *noon_nadir))
         validate_orbit_degrees(em.orbit_degrees)
         validate_rotation_degrees(em.rotation_degrees)
 
@@ -181,7 +204,11 @@ def main():
             take_steps(True, steppers[1], steps, sleep)
             rotation_steps_floor = next_rotation_steps_floor
 
-        time.sleep(60)
+        # sleep until the next step boundary of either motor rather than polling
+        next_tt = min(earth.next_orbit_step_tt(tt, *seasons, STEPS_PER_DEGREE),
+                      earth.next_rotation_step_tt(tt, *seasons, *noon_nadir, STEPS_PER_DEGREE))
+
+        time.sleep(max(next_tt - tt, 0) * SECONDS_PER_DAY + STEP_SLEEP_PADDING)
 
 
 if __name__ == '__main__':